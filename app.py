@@ -1,84 +1,116 @@
 from fastapi import FastAPI, Request, Form
-import requests
+import httpx
 import os
+from types import MappingProxyType
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, Response
 
 app = FastAPI()
 
 app.mount("/static", StaticFiles(directory="templates/static"), name="static")
 templates = Jinja2Templates(directory="templates")
+templates.env.auto_reload = False
+
+INDEX_TPL = templates.get_template("index.html")
+ADD_TPL = templates.get_template("add.html")
+DIVIDE_TPL = templates.get_template("divide.html")
+MULTI_TPL = templates.get_template("multi.html")
+SUB_TPL = templates.get_template("sub.html")
 
 ADDURLENDPOINT = os.environ.get('ADD_URL_ENDPOINT')
 DIVIDEURLENDPOINT = os.environ.get('DIVIDE_URL_ENDPOINT')
 MULTIURLENDPOINT = os.environ.get('MULTI_URL_ENDPOINT')
 SUBURLENDPOINT = os.environ.get('SUB_URL_ENDPOINT')
 
+#---- refuse to start without the service urls instead of failing per request
+@app.on_event("startup")
+async def check_endpoints():
+    missing = [name for name, url in (
+        ("ADD_URL_ENDPOINT", ADDURLENDPOINT),
+        ("DIVIDE_URL_ENDPOINT", DIVIDEURLENDPOINT),
+        ("MULTI_URL_ENDPOINT", MULTIURLENDPOINT),
+        ("SUB_URL_ENDPOINT", SUBURLENDPOINT),
+    ) if not url]
+    if missing:
+        raise RuntimeError("Service urls not set: " + ", ".join(missing))
+
+#---- shared http client, keeps connections to the services alive
+@app.on_event("startup")
+async def open_http_client():
+    app.state.http = httpx.AsyncClient(http2=True, timeout=5.0, limits=httpx.Limits(max_keepalive_connections=100, max_connections=200))
+
+@app.on_event("shutdown")
+async def close_http_client():
+    await app.state.http.aclose()
+
+#---- pages rendered with show=0 never change for a given base url (url_for
+#---- builds absolute links), so keep their bytes instead of re-rendering
+BLANK_PAGE_CACHE_SIZE = 64
+blank_pages = {}
+
+def blank_page(request, template):
+    key = (template.name, str(request.base_url))
+    page = blank_pages.get(key)
+    if page is None:
+        page = template.render({"request": request, "show": 0}).encode()
+        if len(blank_pages) < BLANK_PAGE_CACHE_SIZE:
+            blank_pages[key] = page
+    return Response(page, media_type="text/html")
+
+#---- operation -> (template, service endpoint)
+OPS = MappingProxyType({
+    "add": (ADD_TPL, ADDURLENDPOINT),
+    "divide": (DIVIDE_TPL, DIVIDEURLENDPOINT),
+    "multi": (MULTI_TPL, MULTIURLENDPOINT),
+    "sub": (SUB_TPL, SUBURLENDPOINT),
+})
+
+async def perform(op, request, First_Number, Second_Number):
+    template, endpoint = OPS[op]
+    if not First_Number or not Second_Number:
+        return blank_page(request, template)
+    show = 1
+    ans = await request.app.state.http.get(endpoint, params={"first_number": First_Number, "second_number": Second_Number})
+    return HTMLResponse(template.render({"request": request, "answer": ans.text, "show": show}))
+
 #---- index render
-@app.get("/")
-async def add_blank(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+@app.route("/", methods=["GET"], include_in_schema=False)
+async def index_page(request: Request):
+    return blank_page(request, INDEX_TPL)
 
 #---- addition render
-@app.get("/add")
-async def add_blank(request: Request):
-    show = 0
-    return templates.TemplateResponse("add.html", {"request": request, "show": show})
+@app.route("/add", methods=["GET"], include_in_schema=False)
+async def add_page(request: Request):
+    return blank_page(request, ADD_TPL)
 
 @app.post("/add")
 async def parse_data(request: Request, First_Number: int = Form(None), Second_Number: int = Form(None)):
-    if not First_Number or not Second_Number:
-        show = 0
-        return templates.TemplateResponse("add.html", {"request": request, "show": show})
-    else:
-        show = 1
-        ans = requests.get(ADDURLENDPOINT, params={"first_number": First_Number, "second_number": Second_Number})
-        return templates.TemplateResponse("add.html", {"request": request, "answer": ans.text, "show": show})
+    return await perform("add", request, First_Number, Second_Number)
 
 #---- divide render
-@app.get("/divide")
-async def add_blank(request: Request):
-    show = 0
-    return templates.TemplateResponse("divide.html", {"request": request, "show": show})
+@app.route("/divide", methods=["GET"], include_in_schema=False)
+async def divide_page(request: Request):
+    return blank_page(request, DIVIDE_TPL)
 
 @app.post("/divide")
 async def parse_data(request: Request, First_Number: int = Form(None), Second_Number: int = Form(None)):
-    if not First_Number or not Second_Number:
-        show = 0
-        return templates.TemplateResponse("divide.html", {"request": request, "show": show})
-    else:
-        show = 1
-        ans = requests.get(DIVIDEURLENDPOINT, params={"first_number": First_Number, "second_number": Second_Number})
-        return templates.TemplateResponse("divide.html", {"request": request, "answer": ans.text, "show": show})
+    return await perform("divide", request, First_Number, Second_Number)
 
 #---- multi render
-@app.get("/multi")
-async def add_blank(request: Request):
-    show = 0
-    return templates.TemplateResponse("multi.html", {"request": request, "show": show})
+@app.route("/multi", methods=["GET"], include_in_schema=False)
+async def multi_page(request: Request):
+    return blank_page(request, MULTI_TPL)
 
 @app.post("/multi")
 async def parse_data(request: Request, First_Number: int = Form(None), Second_Number: int = Form(None)):
-    if not First_Number or not Second_Number:
-        show = 0
-        return templates.TemplateResponse("multi.html", {"request": request, "show": show})
-    else:
-        show = 1
-        ans = requests.get(MULTIURLENDPOINT, params={"first_number": First_Number, "second_number": Second_Number})
-        return templates.TemplateResponse("multi.html", {"request": request, "answer": ans.text, "show": show})
+    return await perform("multi", request, First_Number, Second_Number)
 
 #---- sub render
-@app.get("/sub")
-async def add_blank(request: Request):
-    show = 0
-    return templates.TemplateResponse("sub.html", {"request": request, "show": show})
+@app.route("/sub", methods=["GET"], include_in_schema=False)
+async def sub_page(request: Request):
+    return blank_page(request, SUB_TPL)
 
 @app.post("/sub")
 async def parse_data(request: Request, First_Number: int = Form(None), Second_Number: int = Form(None)):
-    if not First_Number or not Second_Number:
-        show = 0
-        return templates.TemplateResponse("sub.html", {"request": request, "show": show})
-    else:
-        show = 1
-        ans = requests.get(SUBURLENDPOINT, params={"first_number": First_Number, "second_number": Second_Number})
-        return templates.TemplateResponse("sub.html", {"request": request, "answer": ans.text, "show": show})
+    return await perform("sub", request, First_Number, Second_Number)
\ No newline at end of file